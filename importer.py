@@ -1,19 +1,53 @@
 import json
 import argparse
+import asyncio
+import atexit
+import io
 import logging
+import os
+import random
+import shelve
+import threading
 from base64 import b64encode
-from time import sleep
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import attrgetter, itemgetter
+from time import monotonic, sleep, time
 from datetime import datetime
 
 import spotipy
 from PIL import Image
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ReadTimeout
 from spotipy.exceptions import SpotifyException
 from spotipy.oauth2 import SpotifyOAuth
 from yandex_music import Client, Artist
 
+try:
+    import aiohttp
+except ImportError:  # concurrent search is optional, the importer falls back to sequential requests
+    aiohttp = None
+
+try:
+    import ijson
+except ImportError:  # streaming JSON parse is optional, json.load works for any file size
+    ijson = None
+
+try:
+    from tqdm import tqdm
+except ImportError:  # progress bars are optional
+    tqdm = None
+
 REDIRECT_URI = 'https://open.spotify.com'
 MAX_REQUEST_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+SPOTIFY_SEARCH_URL = 'https://api.spotify.com/v1/search'
+SEARCH_CONCURRENCY = 10  # keeps concurrent searches within Spotify's ~10 req/s budget
+SEARCH_WORKERS = 8  # thread pool size for the spotipy-based search fallback
+JSON_STREAM_THRESHOLD = 10 * 1024 * 1024  # stream-parse JSON exports larger than 10 MB
+SEARCH_CACHE_PATH = '~/.y2s_cache'
+SEARCH_CACHE_TTL = 7 * 24 * 60 * 60  # re-search items (including not-found ones) after a week
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,33 +56,143 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def chunks(lst, n):
-    """Yield successive n-sized chunks from lst."""
-    for i in range(0, len(lst), n):
-        yield lst[i:i + n]
+def chunks(iterable, n):
+    """Yield successive n-sized chunks from any iterable."""
+    iterator = iter(iterable)
+
+    while batch := list(islice(iterator, n)):
+        yield batch
+
+
+def sort_by_timestamp(items, label):
+    """Sort items in place by timestamp (oldest first), if they carry one."""
+    if not items:
+        return
+
+    first = items[0]
+
+    # attrgetter/itemgetter keys avoid a per-element hasattr in the sort
+    if isinstance(first, dict):
+        if 'timestamp' not in first:
+            return
+        key = itemgetter('timestamp')
+    else:
+        if not hasattr(first, 'timestamp'):
+            return
+        key = attrgetter('timestamp')
+
+    logger.info(f'Sorting {len(items)} {label} by timestamp (oldest first)...')
+    items.sort(key=key)
 
 
 def encode_file_base64_jpeg(filename):
     img = Image.open(filename)
+
+    # Re-encode non-JPEG covers in memory instead of round-tripping through disk
     if img.format != 'JPEG':
-        img.convert('RGB').save(filename, 'JPEG')
+        buffer = io.BytesIO()
+        img.convert('RGB').save(buffer, 'JPEG')
+        return b64encode(buffer.getvalue())
 
     with open(filename, 'rb') as f:
         return b64encode(f.read())
 
 
-def handle_spotify_exception(func):
+class ClientRateLimiter:
+    """Token-bucket pacer with AIMD rate adjustment.
+
+    Starts at Spotify's documented ~10 req/s ceiling and only slows down when
+    the server actually reports throttling (429): the rate is halved on each
+    throttle and additively recovered after a streak of successful calls, so
+    the common non-throttled case pays no idle time at all.
+    """
+
+    MAX_RATE = 10.0
+    MIN_RATE = 0.5
+    RECOVERY_SUCCESSES = 20
+    RECOVERY_STEP = 1.0
+
+    def __init__(self, rate=MAX_RATE, burst=10):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last_refill = monotonic()
+        self._successes = 0
+        self._lock = threading.Lock()  # the limiter is shared across importer threads
+
+    def _refill(self):
+        now = monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def reserve(self):
+        """Take a token and return how long the caller should wait, without sleeping."""
+        with self._lock:
+            self._refill()
+            # reserve a token even when the bucket is empty: the deficit
+            # translates into the returned wait and is paid back by refills
+            self.tokens -= 1
+
+            return -self.tokens / self.rate if self.tokens < 0 else 0
+
+    def acquire(self):
+        wait = self.reserve()
+
+        if wait > 0:
+            sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self._successes += 1
+            if self._successes >= self.RECOVERY_SUCCESSES and self.rate < self.MAX_RATE:
+                self.rate = min(self.MAX_RATE, self.rate + self.RECOVERY_STEP)
+                self._successes = 0
+
+    def on_throttle(self):
+        with self._lock:
+            self.rate = max(self.MIN_RATE, self.rate / 2)
+            self.tokens = 0
+            self._successes = 0
+
+        logger.info(f'Throttled by Spotify, lowering request rate to {self.rate}/s')
+
+
+def backoff_delay(attempt):
+    """Exponential backoff with random jitter, so synchronized clients don't retry in lockstep."""
+    return min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt) * (1 + random.uniform(0, 0.5))
+
+
+def handle_spotify_exception(func, limiter=None):
     def wrapper(*args, **kwargs):
         retry = 1
         while True:
+            if limiter is not None:
+                limiter.acquire()
+
             try:
-                return func(*args, **kwargs)
+                result = func(*args, **kwargs)
+
+                if limiter is not None:
+                    limiter.on_success()
+
+                return result
             except SpotifyException as exception:
                 if exception.http_status != 429:
                     raise exception
 
+                if limiter is not None:
+                    limiter.on_throttle()
+
+                if retry > MAX_REQUEST_RETRIES:
+                    logger.info('Max retries reached.')
+                    raise exception
+
                 if 'retry-after' in exception.headers:
                     sleep(int(exception.headers['retry-after']) + 1)
+                else:
+                    sleep(backoff_delay(retry))
+
+                retry += 1
             except ReadTimeout as exception:
                 logger.info(f'Read timed out. Retrying #{retry}...')
 
@@ -56,7 +200,7 @@ def handle_spotify_exception(func):
                     logger.info('Max retries reached.')
                     raise exception
 
-                logger.info('Trying again...')
+                sleep(backoff_delay(retry))
                 retry += 1
 
     return wrapper
@@ -72,131 +216,330 @@ class Importer:
         self.spotify_client = spotify_client
         self.yandex_client = yandex_client
 
+        ignored = set(ignore_list)
         self._importing_items = {
-            'likes': self.import_likes,
-            'playlists': self.import_playlists,
-            'albums': self.import_albums,
-            'artists': self.import_artists
+            name: method
+            for name, method in (
+                ('likes', self.import_likes),
+                ('playlists', self.import_playlists),
+                ('albums', self.import_albums),
+                ('artists', self.import_artists)
+            )
+            if name not in ignored
         }
 
-        for item in ignore_list:
-            del self._importing_items[item]
-
         self._strict_search = strict_search
-
-        self.user = handle_spotify_exception(spotify_client.me)()['id']
+        self._rate_limiter = ClientRateLimiter()
+        self._show_progress = tqdm is not None
+
+        # Pre-wrap the client methods used on hot paths, so each call doesn't
+        # allocate a fresh retry wrapper
+        self._search = handle_spotify_exception(spotify_client.search, self._rate_limiter)
+        self._saved_tracks_add = handle_spotify_exception(spotify_client.current_user_saved_tracks_add, self._rate_limiter)
+        self._playlist_add_tracks = handle_spotify_exception(spotify_client.user_playlist_add_tracks, self._rate_limiter)
+        self._saved_albums_add = handle_spotify_exception(spotify_client.current_user_saved_albums_add, self._rate_limiter)
+        self._follow_artists = handle_spotify_exception(spotify_client.user_follow_artists, self._rate_limiter)
+        self._playlist_create = handle_spotify_exception(spotify_client.user_playlist_create, self._rate_limiter)
+        self._upload_cover_image = handle_spotify_exception(spotify_client.playlist_upload_cover_image, self._rate_limiter)
+
+        # Persistent search cache, so reruns of the importer don't repeat
+        # every search query from scratch
+        self._search_cache = shelve.open(os.path.expanduser(SEARCH_CACHE_PATH))
+        atexit.register(self._search_cache.close)
+
+        # In-memory cache for this run only: libraries commonly contain the same
+        # track both in Likes and in playlists, so dedup identical queries
+        self._session_cache = {}
+        self._cache_lock = threading.Lock()  # shelve doesn't tolerate concurrent writes
+
+        self.user = handle_spotify_exception(spotify_client.me, self._rate_limiter)()['id']
         logger.info(f'User ID: {self.user}')
 
         self.not_imported = {}
 
-    def _import_item(self, item):
+    def _build_search_query(self, item):
+        """Return (type_, item_name, query, fallback_query) for a Yandex item or a plain string."""
         # if the item is a string, it is a query from the JSON file
         if isinstance(item, str):
-            query = item
-            item_name = item
-            type_ = 'track'  # Default type for string items
-            artists = []  # Default artists for string items
+            return 'track', item, item, None
+
         # else it is an object from Yandex
+        is_artist = isinstance(item, Artist)
+        # .lower() suffices for ASCII class names and is faster than .casefold()
+        type_ = 'artist' if is_artist else item.__class__.__name__.lower()
+
+        if is_artist:
+            item_name = item.name
+            artists = []
         else:
-            type_ = item.__class__.__name__.casefold()
-            item_name = item.name if isinstance(item, Artist) else f'{", ".join([artist.name for artist in item.artists])} - {item.title}'
-            artists = item.artists if not isinstance(item, Artist) else []  # Artists for Yandex items
+            artists = item.artists
+            # generator join avoids building an intermediate list per item
+            item_name = f'{", ".join(artist.name for artist in artists)} - {item.title}'
+
+        # A workaround for when track name is too long (100+ characters) there is an exception happening
+        # because spotify API can not process it.
+        if len(item_name) > 100:
+            item_name = item_name[:100]
+            logger.info('Name too long... Trimming to 100 characters. May affect search accuracy')
+
+        query = item_name.replace('- ', '')
 
-            # A workaround for when track name is too long (100+ characters) there is an exception happening
-            # because spotify API can not process it.
-            if len(item_name) > 100:
-                item_name = item_name[:100]
-                logger.info('Name too long... Trimming to 100 characters. May affect search accuracy')
+        fallback_query = None
+        if not self._strict_search and not is_artist and len(artists) > 1:
+            fallback_query = f'{artists[0].name} {item.title}'
 
-            query = item_name.replace('- ', '')
+        return type_, item_name, query, fallback_query
 
-        found_items = handle_spotify_exception(self.spotify_client.search)(query, type=type_)[f'{type_}s']['items']
-        logger.info(f'Importing {type_}: {item_name}...')
+    def _check_search_cache(self, cache_key, item_name, type_):
+        """Return a cached Spotify ID, raise NotFoundException for a cached miss, or return None when absent/expired."""
+        with self._cache_lock:
+            if cache_key in self._session_cache:
+                spotify_id = self._session_cache[cache_key]
+            else:
+                cached = self._search_cache.get(cache_key)
+
+                if cached is None:
+                    return None
+
+                spotify_id, cached_at = cached
 
-        if not self._strict_search and not isinstance(item, Artist) and not len(found_items) and len(artists) > 1:
-            query = f'{artists[0].name} {item.title}'
-            found_items = handle_spotify_exception(self.spotify_client.search)(query, type=type_)[f'{type_}s']['items']
+                if time() - cached_at >= SEARCH_CACHE_TTL:
+                    return None
 
-        logger.info(f'Searching "{query}"...')
+                self._session_cache[cache_key] = spotify_id
+
+        # lazy %s formatting: the message isn't built unless DEBUG is enabled
+        logger.debug('Importing %s: %s... (cached)', type_, item_name)
+
+        if spotify_id is None:
+            raise NotFoundException(item_name)
+
+        return spotify_id
+
+    def _store_search_result(self, cache_key, spotify_id):
+        with self._cache_lock:
+            self._session_cache[cache_key] = spotify_id
+            self._search_cache[cache_key] = (spotify_id, time())
+
+    def _import_item(self, item):
+        type_, item_name, query, fallback_query = self._build_search_query(item)
+
+        cache_key = f'{type_}|{query.casefold().strip()}'
+        cached_id = self._check_search_cache(cache_key, item_name, type_)
+
+        if cached_id is not None:
+            return cached_id
+
+        search = self._search  # local binding, skips an attribute lookup per call
+
+        found_items = search(query, type=type_)[f'{type_}s']['items']
+        logger.debug('Importing %s: %s...', type_, item_name)
+
+        if not len(found_items) and fallback_query is not None:
+            query = fallback_query
+            found_items = search(query, type=type_)[f'{type_}s']['items']
+
+        logger.debug('Searching "%s"...', query)
 
         if not len(found_items):
+            self._store_search_result(cache_key, None)
             raise NotFoundException(item_name)
 
-        return found_items[0]['id']
+        spotify_id = found_items[0]['id']
+        self._store_search_result(cache_key, spotify_id)
 
-    def _add_items_to_spotify(self, items, not_imported_section, save_items_callback, api_method, playlist_id=None):
+        return spotify_id
+
+    async def _search_async(self, session, query, type_):
+        """Issue one search against the Spotify Web API, with capped retries like the sync wrapper."""
+        token = self.spotify_client.auth_manager.get_access_token(as_dict=False)
+        params = {'q': query, 'type': type_}
+        headers = {'Authorization': f'Bearer {token}'}
+        retry = 1
+
+        while True:
+            delay = None
+
+            # consume the limiter shared with the other importer threads, so the
+            # combined request rate stays within budget (and honours halving on 429s)
+            wait = self._rate_limiter.reserve()
+
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            try:
+                async with session.get(SPOTIFY_SEARCH_URL, params=params, headers=headers) as response:
+                    if response.status == 429:
+                        self._rate_limiter.on_throttle()
+                        delay = int(response.headers.get('Retry-After', 1)) + 1
+
+                    response.raise_for_status()
+                    payload = await response.json()
+                    self._rate_limiter.on_success()
+
+                    return payload[f'{type_}s']['items']
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exception:
+                if retry > MAX_REQUEST_RETRIES:
+                    logger.info('Max retries reached.')
+                    raise exception
+
+                logger.debug('Search request failed (%s). Retrying #%s...', exception, retry)
+                await asyncio.sleep(delay if delay is not None else backoff_delay(retry))
+                retry += 1
+
+    async def _import_item_async(self, session, semaphore, item):
+        type_, item_name, query, fallback_query = self._build_search_query(item)
+
+        cache_key = f'{type_}|{query.casefold().strip()}'
+        cached_id = self._check_search_cache(cache_key, item_name, type_)
+
+        if cached_id is not None:
+            return cached_id
+
+        async with semaphore:
+            found_items = await self._search_async(session, query, type_)
+            logger.debug('Importing %s: %s...', type_, item_name)
+
+            if not len(found_items) and fallback_query is not None:
+                found_items = await self._search_async(session, fallback_query, type_)
+
+        if not len(found_items):
+            self._store_search_result(cache_key, None)
+            raise NotFoundException(item_name)
+
+        spotify_id = found_items[0]['id']
+        self._store_search_result(cache_key, spotify_id)
+
+        return spotify_id
+
+    async def _search_items_async(self, items, not_imported_section):
+        """Search all items concurrently and return their Spotify IDs in the original order."""
+        semaphore = asyncio.Semaphore(SEARCH_CONCURRENCY)
         spotify_items = []
-        
-        # Process items to get Spotify IDs while maintaining order
-        for item in items:
-            # if True:
-            if not item.available: # process hidden tracks
-                try:
-                    spotify_id = self._import_item(item)
-                    if spotify_id is None:
-                        logger.warning('Item ID is None, skipping...')
-                        continue
-                    spotify_items.append(spotify_id)
-                    logger.info('OK')
-                except NotFoundException as exception:
-                    not_imported_section.append(exception.item_name)
-                    logger.warning('NO')
-                except SpotifyException:
+        progress = tqdm(total=len(items), desc='Searching', unit='item') if self._show_progress else None
+
+        async def search_one(item):
+            try:
+                return await self._import_item_async(session, semaphore, item)
+            finally:
+                if progress is not None:
+                    progress.update(1)
+
+        # one session for the whole batch, so connections are reused across searches;
+        # honour the same request timeout the spotipy client was configured with
+        timeout = aiohttp.ClientTimeout(total=self.spotify_client.requests_timeout)
+
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            results = await asyncio.gather(
+                *[search_one(item) for item in items],
+                return_exceptions=True
+            )
+
+        if progress is not None:
+            progress.close()
+
+        # gather() returns results in submission order, preserving the item ordering
+        for item, result in zip(items, results):
+            if isinstance(result, NotFoundException):
+                not_imported_section.append(result.item_name)
+                logger.debug('NO')
+            elif isinstance(result, Exception):
+                not_imported_section.append(item.title if hasattr(item, 'title') else str(item))
+                logger.debug('NO')
+            elif result is None:
+                logger.warning('Item ID is None, skipping...')
+            else:
+                spotify_items.append(result)
+                logger.debug('OK')
+
+        return spotify_items
+
+    def _search_items_threaded(self, items, not_imported_section):
+        """Search items on a thread pool (spotipy is thread-safe per client), preserving order."""
+        def search_one(item):
+            try:
+                return self._import_item(item)
+            except SpotifyException as exception:
+                return exception
+
+        spotify_items = []
+        progress = tqdm(total=len(items), desc='Searching', unit='item') if self._show_progress else None
+
+        with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+            # executor.map returns results in submission order, preserving the item ordering
+            for item, result in zip(items, executor.map(search_one, items)):
+                if progress is not None:
+                    progress.update(1)
+
+                if isinstance(result, NotFoundException):
+                    not_imported_section.append(result.item_name)
+                    logger.debug('NO')
+                elif isinstance(result, Exception):
                     not_imported_section.append(item.title if hasattr(item, 'title') else str(item))
-                    logger.warning('NO')
+                    logger.debug('NO')
+                elif result is None:
+                    logger.warning('Item ID is None, skipping...')
+                else:
+                    spotify_items.append(result)
+                    logger.debug('OK')
+
+        if progress is not None:
+            progress.close()
+
+        return spotify_items
+
+    def _add_items_to_spotify(self, items, not_imported_section, save_items_callback, api_method, playlist_id=None):
+        # if True:
+        to_import = [item for item in items if not item.available]  # process hidden tracks
+
+        # Search phase: overlap the search round-trips instead of paying them one by one
+        if aiohttp is not None:
+            spotify_items = asyncio.run(self._search_items_async(to_import, not_imported_section))
+        else:
+            spotify_items = self._search_items_threaded(to_import, not_imported_section)
 
         if not spotify_items:
             logger.info('No valid Spotify items to add.')
             return
         
-        logger.info(f"Adding {len(spotify_items)} items one by one with sleep timeout...")
-        
-        # Process tracks one by one
-        for i, item_id in enumerate(spotify_items):
-            logger.info(f"Adding item {i+1}/{len(spotify_items)}: {item_id}")
-            
+        def add_ids(ids):
+            if api_method == "tracks":
+                self._saved_tracks_add(ids)
+            elif api_method == "playlist_tracks":
+                self._playlist_add_tracks(self.user, playlist_id, ids)
+            elif api_method == "albums":
+                self._saved_albums_add(ids)
+            elif api_method == "artists":
+                self._follow_artists(ids)
+
+        # Spotify accepts up to 100 IDs per playlist add and 50 per library add
+        chunk_size = 100 if api_method == "playlist_tracks" else 50
+
+        logger.info(f"Adding {len(spotify_items)} items in chunks of {chunk_size}...")
+
+        # chunks() preserves order, so items land in Spotify in the same order
+        for chunk in chunks(spotify_items, chunk_size):
             try:
-                if api_method == "tracks":
-                    handle_spotify_exception(self.spotify_client.current_user_saved_tracks_add)([item_id])
-                elif api_method == "playlist_tracks":
-                    # Add at the end of the playlist, one by one
-                    handle_spotify_exception(self.spotify_client.user_playlist_add_tracks)(
-                        self.user, 
-                        playlist_id, 
-                        [item_id]
-                    )
-                elif api_method == "albums":
-                    handle_spotify_exception(self.spotify_client.current_user_saved_albums_add)([item_id])
-                elif api_method == "artists":
-                    handle_spotify_exception(self.spotify_client.user_follow_artists)([item_id])
-                
-                logger.info(f"Item {i+1} successfully added")
-                
-                # Add sleep timeout between requests to avoid rate limiting and ensure proper ordering
-                sleep(1)  # 1 second timeout between adding tracks
-                
-            except Exception as e:
-                logger.error(f"Error adding item {item_id}: {str(e)}")
-                not_imported_section.append(item_id)
+                add_ids(chunk)
+                logger.info(f"Added chunk of {len(chunk)} items")
+            except Exception:
+                # One bad ID shouldn't drop the whole chunk — retry its items one by one
+                logger.warning(f"Chunk of {len(chunk)} items failed, retrying one by one...")
+
+                for item_id in chunk:
+                    try:
+                        add_ids([item_id])
+                    except Exception as e:
+                        logger.error(f"Error adding item {item_id}: {str(e)}")
+                        not_imported_section.append(item_id)
 
     def import_likes(self):
         self.not_imported['Likes'] = []
 
-        # Get all liked tracks
+        # Get all liked tracks, oldest first
         likes_tracks = self.yandex_client.users_likes_tracks().tracks
-        
-        # Sort by timestamp (oldest first)
-        if likes_tracks and hasattr(likes_tracks[0], 'timestamp'):
-            logger.info("Sorting liked tracks by timestamp (oldest first)...")
-            likes_tracks.sort(key=lambda x: x.timestamp if hasattr(x, 'timestamp') else 0)
-            
-            # Log the sorted order
-            for i, track in enumerate(likes_tracks[:5]):
-                logger.info(f"Track {i}: {track.id} - Timestamp: {track.timestamp if hasattr(track, 'timestamp') else 'N/A'}")
-            
-            if len(likes_tracks) > 5:
-                logger.info(f"... and {len(likes_tracks) - 5} more tracks")
-        
+        sort_by_timestamp(likes_tracks, 'liked tracks')
+
         # Get track IDs in the sorted order
         track_ids = [f'{track.id}:{track.album_id}' for track in likes_tracks if track.album_id]
         
@@ -209,91 +552,70 @@ class Importer:
 
     def import_playlists(self):
         playlists = self.yandex_client.users_playlists_list()
-        for playlist in playlists:
-            spotify_playlist = handle_spotify_exception(self.spotify_client.user_playlist_create)(self.user, playlist.title)
-            spotify_playlist_id = spotify_playlist['id']
 
-            logger.info(f'Importing playlist {playlist.title}...')
+        with ThreadPoolExecutor(max_workers=1) as cover_executor:
+            for playlist in playlists:
+                spotify_playlist = self._playlist_create(self.user, playlist.title)
+                spotify_playlist_id = spotify_playlist['id']
 
-            if playlist.cover and hasattr(playlist.cover, 'type') and playlist.cover.type == 'pic':
-                filename = f'{playlist.kind}-cover'
-                playlist.cover.download(filename, size='400x400')
+                logger.info(f'Importing playlist {playlist.title}...')
 
-                handle_spotify_exception(self.spotify_client.playlist_upload_cover_image)(spotify_playlist_id, encode_file_base64_jpeg(filename))
+                cover_future = None
 
-            self.not_imported[playlist.title] = []
+                if playlist.cover and hasattr(playlist.cover, 'type') and playlist.cover.type == 'pic':
+                    filename = f'{playlist.kind}-cover'
+                    playlist.cover.download(filename, size='400x400')
 
-            # Fetch playlist tracks
-            logger.info(f"Fetching tracks for playlist: {playlist.title}")
-            playlist_tracks = playlist.fetch_tracks()
-            
-            # Sort by timestamp if can
-            if playlist_tracks and hasattr(playlist_tracks[0], 'timestamp'):
-                logger.info(f"Sorting {len(playlist_tracks)} playlist tracks by timestamp (oldest first)...")
-                playlist_tracks.sort(key=lambda x: x.timestamp if hasattr(x, 'timestamp') else 0)
-                
-                # Log the first few tracks to verify order
-                for i, track in enumerate(playlist_tracks[:5]):
-                    logger.info(f"Track {i}: ID {track.track_id} - Timestamp: {track.timestamp if hasattr(track, 'timestamp') else 'N/A'}")
-                
-                if len(playlist_tracks) > 5:
-                    logger.info(f"... and {len(playlist_tracks) - 5} more tracks")
-            
-            # Process track data based on playlist type
-            if not playlist.collective:
-                # For regular playlists
-                tracks = []
-                for track_info in playlist_tracks:
-                    if hasattr(track_info, 'track') and track_info.track:
-                        tracks.append(track_info.track)
-                    else:
-                        logger.warning(f"Missing track data for track in playlist {playlist.title}")
-            elif playlist.collective and playlist_tracks:
-                # For collective playlists, maintain the order after sorting
-                track_ids = [track.track_id for track in playlist_tracks]
-                
-                # Log the order of track IDs
-                logger.info(f"Fetching tracks in this order: {track_ids[:5]}... (and {len(track_ids)-5} more)")
-                
-                # Fetch all tracks at once
-                all_tracks = self.yandex_client.tracks(track_ids)
-                
-                # Create a map of tracks by ID
-                tracks_map = {str(track.id): track for track in all_tracks}
-                
-                # Rebuild the tracks list in the original (sorted) order
-                tracks = []
-                for track_id in track_ids:
-                    track = tracks_map.get(str(track_id))
-                    if track:
-                        tracks.append(track)
-                    else:
-                        logger.warning(f"Could not find track with ID {track_id} in fetched tracks")
-            else:
-                tracks = []
+                    # Upload the cover in the background while the tracks are searched
+                    cover_future = cover_executor.submit(
+                        self._upload_cover_image, spotify_playlist_id, encode_file_base64_jpeg(filename))
+
+                self.not_imported[playlist.title] = []
 
-            logger.info(f'Processing {len(tracks)} tracks for playlist {playlist.title}')
+                # Fetch playlist tracks
+                logger.info(f"Fetching tracks for playlist: {playlist.title}")
+                playlist_tracks = playlist.fetch_tracks()
+                sort_by_timestamp(playlist_tracks, 'playlist tracks')
+
+                # Process track data based on playlist type
+                if not playlist.collective:
+                    # For regular playlists
+                    tracks = []
+                    for track_info in playlist_tracks:
+                        if hasattr(track_info, 'track') and track_info.track:
+                            tracks.append(track_info.track)
+                        else:
+                            logger.warning(f"Missing track data for track in playlist {playlist.title}")
+                elif playlist.collective and playlist_tracks:
+                    # For collective playlists, maintain the order after sorting
+                    track_ids = [track.track_id for track in playlist_tracks]
+
+                    # Log the order of track IDs
+                    logger.info(f"Fetching tracks in this order: {track_ids[:5]}... (and {len(track_ids)-5} more)")
+
+                    # Fetch all tracks at once; yandex_client.tracks() preserves the input order
+                    tracks = self.yandex_client.tracks(track_ids)
+
+                    if len(tracks) != len(track_ids):
+                        logger.warning(f"Requested {len(track_ids)} tracks but fetched {len(tracks)}")
+                else:
+                    tracks = []
+
+                logger.info(f'Processing {len(tracks)} tracks for playlist {playlist.title}')
             
-            # Add tracks to Spotify playlist in the correct order
-            self._add_items_to_spotify(tracks, self.not_imported[playlist.title], None, "playlist_tracks", spotify_playlist_id)
+                # Add tracks to Spotify playlist in the correct order
+                self._add_items_to_spotify(tracks, self.not_imported[playlist.title], None, "playlist_tracks", spotify_playlist_id)
+
+                # Surface any cover-upload failure before moving to the next playlist
+                if cover_future is not None:
+                    cover_future.result()
 
     def import_albums(self):
         self.not_imported['Albums'] = []
 
         likes_albums = self.yandex_client.users_likes_albums()
-        
-        # Sort albums by timestamp (oldest first)
-        if likes_albums and hasattr(likes_albums[0], 'timestamp'):
-            logger.info("Sorting albums by timestamp (oldest first)...")
-            likes_albums.sort(key=lambda x: x.timestamp if hasattr(x, 'timestamp') else 0)
-            
-            # Log the sorted order
-            for i, album in enumerate(likes_albums[:5]):
-                logger.info(f"Album {i}: {album.album.id if hasattr(album, 'album') else 'N/A'} - Timestamp: {album.timestamp if hasattr(album, 'timestamp') else 'N/A'}")
-            
-            if len(likes_albums) > 5:
-                logger.info(f"... and {len(likes_albums) - 5} more albums")
-        
+        sort_by_timestamp(likes_albums, 'albums')
+
         albums = [album.album for album in likes_albums if hasattr(album, 'album')]
         logger.info(f'Importing {len(albums)} albums in chronological order...')
         
@@ -304,19 +626,8 @@ class Importer:
         self.not_imported['Artists'] = []
 
         likes_artists = self.yandex_client.users_likes_artists()
-        
-        # Sort artists by timestamp if can
-        if likes_artists and hasattr(likes_artists[0], 'timestamp'):
-            logger.info("Sorting artists by timestamp (oldest first)...")
-            likes_artists.sort(key=lambda x: x.timestamp if hasattr(x, 'timestamp') else 0)
-            
-            # Log the sorted order
-            for i, artist in enumerate(likes_artists[:5]):
-                logger.info(f"Artist {i}: {artist.artist.id if hasattr(artist, 'artist') else 'N/A'} - Timestamp: {artist.timestamp if hasattr(artist, 'timestamp') else 'N/A'}")
-            
-            if len(likes_artists) > 5:
-                logger.info(f"... and {len(likes_artists) - 5} more artists")
-        
+        sort_by_timestamp(likes_artists, 'artists')
+
         artists = [artist.artist for artist in likes_artists if hasattr(artist, 'artist')]
         logger.info(f'Importing {len(artists)} artists in chronological order...')
         
@@ -324,8 +635,19 @@ class Importer:
         self._add_items_to_spotify(artists, self.not_imported['Artists'], None, "artists")
 
     def import_all(self):
-        for item in self._importing_items.values():
-            item()
+        # The importers hit disjoint endpoints, so overlap them; the shared
+        # rate limiter keeps the combined request rate within budget
+        if self._importing_items:
+            # concurrent phases would interleave their progress bars on one
+            # terminal line, so fall back to plain logging for this run
+            if len(self._importing_items) > 1:
+                self._show_progress = False
+
+            with ThreadPoolExecutor(max_workers=len(self._importing_items)) as executor:
+                futures = [executor.submit(item) for item in self._importing_items.values()]
+
+                for future in futures:
+                    future.result()
 
         self.print_not_imported()
 
@@ -337,42 +659,26 @@ class Importer:
                 logger.info(item)
 
     def import_from_json(self, file_path):
-        with open(file_path, 'r', encoding='UTF-8') as file:
-            tracks = json.load(file)
+        if ijson is not None and os.path.getsize(file_path) > JSON_STREAM_THRESHOLD:
+            # Stream-parse large exports so intermediate parser state doesn't double the peak RSS
+            with open(file_path, 'rb') as file:
+                tracks = list(ijson.items(file, 'item'))
+        else:
+            with open(file_path, 'r', encoding='UTF-8') as file:
+                tracks = json.load(file)
 
         # If the JSON file has timestamps, sort by those
-        if tracks and 'timestamp' in tracks[0]:
-            logger.info("Sorting JSON tracks by timestamp (oldest first)...")
-            tracks.sort(key=lambda x: x.get('timestamp', 0))
-            
-            # Log the sorted order
-            for i, track in enumerate(tracks[:5]):
-                logger.info(f"Track {i}: {track.get('artist', 'Unknown')} - {track.get('track', 'Unknown')} - Timestamp: {track.get('timestamp', 'N/A')}")
-            
-            if len(tracks) > 5:
-                logger.info(f"... and {len(tracks) - 5} more tracks")
+        sort_by_timestamp(tracks, 'JSON tracks')
 
-        spotify_tracks = []
         not_imported = []
 
-        # Process tracks in order
-        for track in tracks:
-            query = f'{track["artist"]} {track["track"]}'
-
-            try:
-                spotify_track_id = self._import_item(query)
-                spotify_tracks.append(spotify_track_id)
-                logger.info('OK')
-            except NotFoundException as exception:
-                not_imported.append(exception.item_name)
-                logger.warning('NO')
-            except SpotifyException:
-                not_imported.append(query)
-                logger.warning('NO')
+        # Search tracks in parallel; results come back in the original order
+        queries = [f'{track["artist"]} {track["track"]}' for track in tracks]
+        spotify_tracks = self._search_items_threaded(queries, not_imported)
 
         # Create a new playlist
         playlist_name = 'Imported from JSON'
-        playlist = handle_spotify_exception(self.spotify_client.user_playlist_create)(self.user, playlist_name)
+        playlist = self._playlist_create(self.user, playlist_name)
         playlist_id = playlist['id']
         
         logger.info(f"Created playlist '{playlist_name}' with ID {playlist_id}")
@@ -383,7 +689,7 @@ class Importer:
         
         for i, chunk in enumerate(chunks_list):
             logger.info(f"Adding chunk {i+1}/{len(chunks_list)} with {len(chunk)} tracks to playlist")
-            handle_spotify_exception(self.spotify_client.user_playlist_add_tracks)(self.user, playlist_id, chunk)
+            self._playlist_add_tracks(self.user, playlist_id, chunk)
             logger.info(f"Chunk {i+1} successfully added")
 
         logger.error('Not imported tracks:')
@@ -425,6 +731,11 @@ if __name__ == '__main__':
             raise ValueError('Either the -t (token) or -j (json_path) argument must be specified.')
 
         spotify_client_ = spotipy.Spotify(auth_manager=auth_manager, requests_timeout=arguments.timeout)
+
+        # Widen the keep-alive pool so threaded searches don't queue on connections,
+        # and disable requests-level retries — handle_spotify_exception owns retrying
+        spotify_client_._session.mount('https://', HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=0))
+
         yandex_client_ = None
 
         if arguments.token: